@@ -6,4 +6,6 @@ admin.site.register(User)
 admin.site.register(Project)
 admin.site.register(ProjectMember)
 admin.site.register(Task)
-admin.site.register(Comment)
\ No newline at end of file
+admin.site.register(Comment)
+admin.site.register(Notification)
+admin.site.register(Job)
\ No newline at end of file
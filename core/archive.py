@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import Case, Value, When
+
+from .models import Task, Comment, ArchivedTask, ArchivedComment
+
+TASK_FIELDS = ['id', 'title', 'description', 'status', 'priority',
+               'project_id', 'assigned_to_id', 'created_at', 'due_date', 'completed_at']
+COMMENT_FIELDS = ['id', 'content', 'user_id', 'task_id', 'created_at']
+
+
+def archive_done_tasks(before, chunk_size=500):
+    """
+    Moves tasks completed before `before`, with their comments, into the
+    archive tables. Each chunk is copied and deleted in its own transaction.
+    Chunks are read from the (status, completed_at) index; archived rows
+    leave the range, so every chunk starts at the front of what is left.
+    Returns the number of tasks and comments archived.
+    """
+    counts = {'tasks': 0, 'comments': 0}
+    candidates = Task.objects.filter(status='done', completed_at__lt=before)
+
+    while True:
+        ids = list(candidates.order_by('completed_at').values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return counts
+
+        with transaction.atomic():
+            # Re-check under lock in case a task was reopened meanwhile
+            tasks = list(candidates.select_for_update().filter(id__in=ids).values(*TASK_FIELDS))
+            task_ids = [task['id'] for task in tasks]
+            comments = list(Comment.objects.filter(task_id__in=task_ids).values(*COMMENT_FIELDS))
+
+            ArchivedTask.objects.bulk_create(ArchivedTask(**task) for task in tasks)
+            ArchivedComment.objects.bulk_create(ArchivedComment(**comment) for comment in comments)
+
+            Comment.objects.filter(task_id__in=task_ids).delete()
+            Task.objects.filter(id__in=task_ids).delete()
+
+        counts['tasks'] += len(tasks)
+        counts['comments'] += len(comments)
+
+
+def restore_tasks(task_ids):
+    """
+    Moves archived tasks and their comments back into the live tables under
+    their original ids. Returns the ids that were restored.
+    """
+    with transaction.atomic():
+        tasks = list(ArchivedTask.objects.select_for_update().filter(id__in=task_ids).values(*TASK_FIELDS))
+        restored_ids = [task['id'] for task in tasks]
+        comments = list(ArchivedComment.objects.filter(task_id__in=restored_ids).values(*COMMENT_FIELDS))
+
+        Task.objects.bulk_create(Task(**task) for task in tasks)
+        Comment.objects.bulk_create(Comment(**comment) for comment in comments)
+
+        # created_at is auto_now_add, so bulk_create stamped the current time
+        _restore_created_at(Task, tasks)
+        _restore_created_at(Comment, comments)
+
+        ArchivedTask.objects.filter(id__in=restored_ids).delete()
+
+    return restored_ids
+
+
+def _restore_created_at(model, rows):
+    """
+    Sets created_at back to the archived values with a single UPDATE
+    """
+    if not rows:
+        return
+    model.objects.filter(id__in=[row['id'] for row in rows]).update(
+        created_at=Case(*[When(id=row['id'], then=Value(row['created_at'])) for row in rows])
+    )
@@ -0,0 +1,247 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Project, ProjectMember, Task, Comment, ArchivedTask, ArchivedComment, Job
+
+JOB_HANDLERS = {}
+
+
+class LeaseLost(Exception):
+    """
+    Raised when a running job was reclaimed from this worker, so the handler
+    stops instead of running alongside the new attempt
+    """
+
+
+def job_setting(name):
+    """
+    Returns a JOB_QUEUE setting, falling back to the built-in default
+    """
+    defaults = {
+        'CHUNK_SIZE': 500,
+        'MAX_ATTEMPTS': 3,
+        'RETRY_DELAY': 30,
+        'DELETE_THRESHOLD': 1000,
+        'LEASE_TIMEOUT': 1800,
+    }
+    return getattr(settings, 'JOB_QUEUE', {}).get(name, defaults[name])
+
+
+def register(kind):
+    """
+    Registers a function as the handler for jobs of the given kind
+    """
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, user=None):
+    """
+    Queues a job for the worker and returns it
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        created_by=user,
+        max_attempts=job_setting('MAX_ATTEMPTS'),
+    )
+
+
+def pending_job(kind, project_id):
+    """
+    Returns the queued or running job of this kind for a project, if any
+    """
+    return Job.objects.filter(
+        kind=kind, status__in=['queued', 'running'], payload__project_id=project_id
+    ).first()
+
+
+def owned(job):
+    """
+    The job's row while it is still running the attempt this worker claimed
+    """
+    return Job.objects.filter(pk=job.pk, status='running', attempts=job.attempts)
+
+
+def touch(job):
+    """
+    Renews the lease of a running job so it is not reclaimed as abandoned.
+    Raises LeaseLost if the job was already reclaimed.
+    """
+    if not owned(job).update(updated_at=timezone.now()):
+        raise LeaseLost(f"Job #{job.pk} was reclaimed by another worker")
+
+
+def reclaim_abandoned_jobs(now):
+    """
+    Requeues running jobs whose lease expired, e.g. because their worker was
+    killed. Attempts are counted when a job is claimed, so a job that keeps
+    killing its worker still ends up failed after max_attempts.
+    """
+    expired = Job.objects.filter(
+        status='running',
+        updated_at__lt=now - timedelta(seconds=job_setting('LEASE_TIMEOUT')),
+    )
+    expired.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', error='Worker lost while running the job', updated_at=now
+    )
+    expired.update(status='queued', run_after=now, updated_at=now)
+
+
+def claim_jobs(limit):
+    """
+    Marks up to `limit` due jobs as running and returns their ids.
+    A job is only claimed if its status is still 'queued' at update time,
+    so several workers can poll the same table safely.
+    """
+    now = timezone.now()
+    reclaim_abandoned_jobs(now)
+
+    candidates = Job.objects.filter(
+        status='queued', run_after__lte=now
+    ).order_by('run_after', 'id').values_list('id', flat=True)[:limit]
+
+    claimed = []
+    for job_id in candidates:
+        updated = Job.objects.filter(pk=job_id, status='queued').update(
+            status='running', updated_at=now, attempts=F('attempts') + 1
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def run_job(job_id):
+    """
+    Runs a claimed job, recording its result or scheduling a retry on failure
+    """
+    job = Job.objects.get(pk=job_id)
+
+    try:
+        job.result = JOB_HANDLERS[job.kind](job)
+    except LeaseLost:
+        return 'lost'
+    except Exception as exc:
+        job.error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts:
+            # Back off linearly so transient lock errors have time to clear
+            job.status = 'queued'
+            job.run_after = timezone.now() + timedelta(
+                seconds=job_setting('RETRY_DELAY') * job.attempts
+            )
+        else:
+            job.status = 'failed'
+    else:
+        job.status = 'done'
+        job.error = ''
+
+    # Only record the outcome if the lease expired and no other worker took the job over
+    if not owned(job).update(
+        status=job.status, result=job.result, error=job.error,
+        run_after=job.run_after, updated_at=timezone.now(),
+    ):
+        return 'lost'
+    return job.status
+
+
+def delete_in_chunks(queryset, chunk_size, job=None):
+    """
+    Deletes the rows of a queryset in short transactions of `chunk_size` rows
+    and returns the number of rows of that model removed, not counting
+    cascaded rows of other models. Renews the job's lease after each chunk.
+    """
+    label = queryset.model._meta.label
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            _, per_model = queryset.model.objects.filter(id__in=ids).delete()
+        deleted += per_model.get(label, 0)
+        if job is not None:
+            touch(job)
+
+
+@register('delete_project')
+def delete_project(job):
+    """
+    Deletes a project bottom-up (comments, tasks, members, archived rows) in
+    chunks so that no single transaction holds locks across the whole cascade
+    """
+    chunk_size = job_setting('CHUNK_SIZE')
+    project_id = job.payload['project_id']
+
+    counts = {
+        'comments': delete_in_chunks(Comment.objects.filter(task__project_id=project_id), chunk_size, job),
+        'tasks': delete_in_chunks(Task.objects.filter(project_id=project_id), chunk_size, job),
+        'members': delete_in_chunks(ProjectMember.objects.filter(project_id=project_id), chunk_size, job),
+        'archived_comments': delete_in_chunks(
+            ArchivedComment.objects.filter(task__project_id=project_id), chunk_size, job
+        ),
+        'archived_tasks': delete_in_chunks(ArchivedTask.objects.filter(project_id=project_id), chunk_size, job),
+    }
+    _, per_model = Project.objects.filter(pk=project_id).delete()
+    counts['projects'] = per_model.get(Project._meta.label, 0)
+    return counts
+
+
+@register('export_project')
+def export_project(job):
+    """
+    Builds a JSON export of a project with its members, tasks and comments.
+    Renews the job's lease after every chunk of rows read.
+    """
+    chunk_size = job_setting('CHUNK_SIZE')
+    project = Project.objects.get(pk=job.payload['project_id'])
+
+    members = ProjectMember.objects.filter(project=project).values('user_id', 'role')
+    tasks = Task.objects.filter(project=project).values(
+        'id', 'title', 'description', 'status', 'priority',
+        'assigned_to_id', 'created_at', 'due_date', 'completed_at'
+    )
+    comments = Comment.objects.filter(task__project=project).values(
+        'id', 'task_id', 'user_id', 'content', 'created_at'
+    )
+
+    return {
+        'project': {
+            'id': project.id,
+            'name': project.name,
+            'description': project.description,
+            'owner_id': project.owner_id,
+            'created_at': project.created_at.isoformat(),
+        },
+        'members': list(_iterate(members, chunk_size, job)),
+        'tasks': [_isoformat(row) for row in _iterate(tasks, chunk_size, job)],
+        'comments': [_isoformat(row) for row in _iterate(comments, chunk_size, job)],
+    }
+
+
+def _iterate(queryset, chunk_size, job):
+    """
+    Iterates over a queryset in chunks, renewing the job's lease after each one
+    """
+    for i, row in enumerate(queryset.iterator(chunk_size=chunk_size), 1):
+        yield row
+        if i % chunk_size == 0:
+            touch(job)
+
+
+def _isoformat(row):
+    """
+    Converts datetime values in a values() row to ISO strings for JSON storage
+    """
+    return {
+        key: value.isoformat() if hasattr(value, 'isoformat') else value
+        for key, value in row.items()
+    }
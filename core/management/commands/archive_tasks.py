@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.archive import archive_done_tasks, restore_tasks
+
+
+class Command(BaseCommand):
+    help = "Move old done tasks and their comments into the archive tables, or restore archived tasks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help="Archive tasks completed more than this many days ago (default: 365)"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help="Tasks moved per transaction (default: 500)"
+        )
+        parser.add_argument(
+            '--restore', type=int, nargs='+', metavar='TASK_ID',
+            help="Restore these archived tasks instead of archiving"
+        )
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = restore_tasks(options['restore'])
+            self.stdout.write(f"Restored {len(restored)} tasks")
+            return
+
+        before = timezone.now() - timedelta(days=options['days'])
+        counts = archive_done_tasks(before, chunk_size=options['chunk_size'])
+        self.stdout.write(f"Archived {counts['tasks']} tasks and {counts['comments']} comments")
@@ -0,0 +1,146 @@
+import random
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F
+from django.test import RequestFactory
+from django.test.utils import (
+    CaptureQueriesContext, setup_test_environment, teardown_test_environment
+)
+from django.utils import timezone
+from rest_framework.test import force_authenticate
+
+from core.models import User, Project, Task
+from core.pagination import DueDateCursorPagination
+from core.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = "Benchmark /api/tasks/mine/ for a user with many assigned tasks, on a throwaway test database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tasks', type=int, default=50000,
+            help="Tasks assigned to the benchmark user (default: 50000)"
+        )
+        parser.add_argument(
+            '--other-tasks', type=int, default=200000,
+            help="Tasks assigned to other users (default: 200000)"
+        )
+        parser.add_argument(
+            '--projects', type=int, default=200,
+            help="Projects the tasks are spread over (default: 200)"
+        )
+        parser.add_argument(
+            '--pages', type=int, default=20,
+            help="Pages to walk with the cursor (default: 20)"
+        )
+        parser.add_argument(
+            '--page-size', type=int, default=50,
+            help="Tasks per page (default: 50)"
+        )
+
+    def handle(self, *args, **options):
+        # Never write benchmark rows to the real database
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = self.seed(options)
+            self.report_plan(user)
+            self.run(user, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, options):
+        self.stdout.write("Seeding...")
+        rng = random.Random(0)
+        now = timezone.now()
+
+        user = User.objects.create(username='bench', email='bench@example.com')
+        others = User.objects.bulk_create(
+            User(username=f'other{i}', email=f'other{i}@example.com') for i in range(100)
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f'Project {i}', owner=user) for i in range(options['projects'])
+        )
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+
+        def tasks(count, assignees):
+            for i in range(count):
+                yield Task(
+                    title=f'Task {i}',
+                    status=rng.choice(statuses),
+                    project=rng.choice(projects),
+                    assigned_to=rng.choice(assignees),
+                    # One in ten tasks has no due date
+                    due_date=None if i % 10 == 0 else now + timedelta(minutes=rng.randint(-50000, 500000)),
+                )
+
+        Task.objects.bulk_create(tasks(options['tasks'], [user]), batch_size=5000)
+        Task.objects.bulk_create(tasks(options['other_tasks'], others), batch_size=5000)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+            elif connection.vendor == 'postgresql':
+                cursor.execute('ANALYZE core_task')
+        return user
+
+    def report_plan(self, user):
+        # The dated range one status contributes to a page after a cursor
+        task = Task.objects.filter(assigned_to=user, status='todo', due_date__isnull=False).order_by('due_date', 'id')[100]
+        queryset = DueDateCursorPagination().dated_range(
+            Task.objects.filter(assigned_to=user, status='todo'), task.due_date, task.id
+        )[:51]
+        self.stdout.write("Query plan for one status of a page after a cursor:")
+        self.stdout.write(queryset.explain())
+
+    def request(self, user, **params):
+        request = RequestFactory().get('/api/tasks/mine/', params)
+        force_authenticate(request, user=user)
+        view = TaskViewSet.as_view({'get': 'mine'}, **TaskViewSet.mine.kwargs)
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = view(request)
+            response.render()
+            elapsed = (time.perf_counter() - start) * 1000
+        return response, elapsed, len(queries)
+
+    def run(self, user, options):
+        page_size = options['page_size']
+
+        timings = []
+        cursor = None
+        for _ in range(options['pages']):
+            params = {'page_size': page_size}
+            if cursor:
+                params['cursor'] = cursor
+            response, elapsed, queries = self.request(user, **params)
+            timings.append(elapsed)
+            next_link = response.data['next']
+            if not next_link:
+                break
+            cursor = parse_qs(urlparse(next_link).query)['cursor'][0]
+
+        self.stdout.write(
+            f"Keyset pages: first {timings[0]:.1f}ms, last {timings[-1]:.1f}ms, "
+            f"mean {sum(timings) / len(timings):.1f}ms over {len(timings)} pages, {queries} queries per page"
+        )
+
+        _, elapsed, queries = self.request(user, page_size=page_size, group_by='project')
+        self.stdout.write(f"Grouped by project: {elapsed:.1f}ms, {queries} queries")
+
+        # The offset-paginated equivalent of the last page walked above, for comparison
+        offset = (len(timings) - 1) * page_size
+        queryset = Task.objects.filter(
+            assigned_to=user, status__in=['todo', 'in_progress']
+        ).select_related('project', 'assigned_to').order_by(F('due_date').asc(nulls_last=True), 'id')
+        start = time.perf_counter()
+        list(queryset[offset:offset + page_size])
+        self.stdout.write(
+            f"Offset page at row {offset} (query only): {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
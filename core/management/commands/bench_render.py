@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from core.middleware import CompressionMiddleware, brotli, compression_setting
+from core.models import User, Project, Task
+from core.renderers import FastJSONRenderer, orjson
+from core.serializers import TaskSerializer
+
+
+def build_tasks(count):
+    """
+    Builds unsaved tasks that look like a real task list, so no database is needed
+    """
+    now = timezone.now()
+    project = Project(id=1, name="Benchmark", owner_id=1)
+    users = [
+        User(id=i, username=f"user{i}", email=f"user{i}@example.com",
+             first_name="Bench", last_name=f"User {i}", date_joined=now)
+        for i in range(1, 51)
+    ]
+    statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+    priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}: review the quarterly planning document",
+            description="Go through the open comments and update the estimates. " * 3,
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+            project=project,
+            assigned_to=users[i % len(users)],
+            created_at=now - timedelta(days=i % 365),
+            due_date=now + timedelta(days=i % 30),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def best_of(repeat, func):
+    """
+    Returns the fastest of `repeat` runs of func in milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON rendering time and compressed size of TaskSerializer lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+            help="Task list lengths to benchmark"
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="Runs per measurement; the fastest is reported (default: 5)"
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"orjson: {'yes' if orjson else 'not installed (stdlib fallback)'}, "
+                          f"brotli: {'yes' if brotli else 'not installed'}")
+        self.stdout.write(
+            f"{'tasks':>7} {'serialize':>11} {'stdlib':>10} {'fast':>10} "
+            f"{'raw':>10} {'gzip':>10} {'br':>10} {'gzip ms':>8} {'br ms':>8}"
+        )
+
+        for size in options['sizes']:
+            tasks = build_tasks(size)
+            repeat = options['repeat']
+
+            serialize_ms = best_of(repeat, lambda: TaskSerializer(tasks, many=True).data)
+            data = TaskSerializer(tasks, many=True).data
+
+            stdlib_ms = best_of(repeat, lambda: JSONRenderer().render(data))
+            fast_ms = best_of(repeat, lambda: FastJSONRenderer().render(data))
+            body = FastJSONRenderer().render(data)
+
+            # Same call and padding as CompressionMiddleware
+            padding = CompressionMiddleware.max_random_bytes
+            gzip_ms = best_of(repeat, lambda: compress_string(body, max_random_bytes=padding))
+            gzipped = len(compress_string(body, max_random_bytes=padding))
+
+            if brotli:
+                quality = compression_setting('BROTLI_QUALITY')
+                br_ms = best_of(repeat, lambda: brotli.compress(body, quality=quality))
+                br_size = f"{len(brotli.compress(body, quality=quality)):,}"
+                br_ms = f"{br_ms:.1f}"
+            else:
+                br_size = br_ms = '-'
+
+            self.stdout.write(
+                f"{size:>7} {serialize_ms:>9.1f}ms {stdlib_ms:>8.1f}ms {fast_ms:>8.1f}ms "
+                f"{len(body):>10,} {gzipped:>10,} {br_size:>10} {gzip_ms:>8.1f} {br_ms:>8}"
+            )
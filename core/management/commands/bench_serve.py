@@ -0,0 +1,189 @@
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from .serve import available_cores
+
+
+def _worker_pids(master_pid):
+    """
+    Returns the pids of the direct children of a process (Linux only)
+    """
+    try:
+        with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+            return [int(pid) for pid in f.read().split()]
+    except OSError:
+        return []
+
+
+def _memory_kb(pid):
+    """
+    Returns (RSS, PSS) of a process in kB. PSS divides shared pages between
+    the processes mapping them, so it shows what copy-on-write saves.
+    """
+    rss = pss = 0
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Rss:'):
+                    rss = int(line.split()[1])
+                elif line.startswith('Pss:'):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def _client(args):
+    """
+    Issues requests against the server until the deadline and returns the
+    number of 2xx responses and of failed requests
+    """
+    host, port, path, headers, deadline = args
+    completed = failed = 0
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if 200 <= response.status < 300:
+                completed += 1
+            else:
+                failed += 1
+        except OSError:
+            failed += 1
+        finally:
+            conn.close()
+    return completed, failed
+
+
+def _auth_headers(username):
+    """
+    Signs an access token so the requests reach the view instead of stopping at a 401
+    """
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    users = get_user_model().objects.filter(is_active=True).order_by('id')
+    user = users.filter(username=username).first() if username else users.first()
+    if user is None:
+        raise CommandError("No active user to authenticate the benchmark requests with")
+    return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+
+def _wait_until_ready(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class Command(BaseCommand):
+    help = "Benchmark memory per worker and throughput of the serve command by worker count"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, nargs='+', default=None,
+            help="Worker counts to test (default: 1, 2, 4, ... up to available cores)"
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10.0,
+            help="Seconds of load per worker count (default: 10)"
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help="Concurrent client processes (default: 2 x worker count)"
+        )
+        parser.add_argument(
+            '--path', default='/api/tasks/mine/',
+            help="Path of the authenticated requests (default: /api/tasks/mine/, one page of tasks)"
+        )
+        parser.add_argument(
+            '--user', default='',
+            help="Username the requests are authenticated as (default: the first active user)"
+        )
+        parser.add_argument(
+            '--port', type=int, default=8765,
+            help="Port for the benchmark server (default: 8765)"
+        )
+        parser.add_argument(
+            '--no-preload', action='store_true',
+            help="Benchmark without preloading, for comparison"
+        )
+
+    def handle(self, *args, **options):
+        if not sys.platform.startswith('linux'):
+            raise CommandError("bench_serve reads worker memory from /proc and only runs on Linux")
+
+        worker_counts = options['workers']
+        if not worker_counts:
+            cores = available_cores()
+            worker_counts = [1]
+            while worker_counts[-1] * 2 <= cores:
+                worker_counts.append(worker_counts[-1] * 2)
+            if worker_counts[-1] != cores:
+                worker_counts.append(cores)
+
+        host, port = '127.0.0.1', options['port']
+        headers = _auth_headers(options['user'])
+        self.stdout.write(
+            f"{'workers':>8} {'req/s':>10} {'errors':>8} {'RSS/worker':>12} {'PSS/worker':>12} {'master PSS':>12}"
+        )
+
+        for workers in worker_counts:
+            server = self._start_server(host, port, workers, options['no_preload'])
+            try:
+                if not _wait_until_ready(host, port):
+                    raise CommandError(f"Server with {workers} workers did not start")
+
+                concurrency = options['concurrency'] or workers * 2
+                deadline = time.monotonic() + options['duration']
+                with Pool(concurrency) as pool:
+                    results = pool.map(_client, [(host, port, options['path'], headers, deadline)] * concurrency)
+                completed = sum(result[0] for result in results)
+                failed = sum(result[1] for result in results)
+                if not completed:
+                    raise CommandError(f"No successful responses from {options['path']} with {workers} workers")
+
+                pids = _worker_pids(server.pid)
+                memory = [_memory_kb(pid) for pid in pids] or [(0, 0)]
+                rss = sum(m[0] for m in memory) / len(memory)
+                pss = sum(m[1] for m in memory) / len(memory)
+                master_pss = _memory_kb(server.pid)[1]
+
+                self.stdout.write(
+                    f"{workers:>8} {completed / options['duration']:>10.1f} {failed:>8} "
+                    f"{rss / 1024:>10.1f}MB {pss / 1024:>10.1f}MB {master_pss / 1024:>10.1f}MB"
+                )
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait()
+
+    def _start_server(self, host, port, workers, no_preload):
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'serve',
+            '--bind', f'{host}:{port}', '--workers', str(workers),
+        ]
+        if no_preload:
+            command.append('--no-preload')
+        return subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=os.environ.copy(),
+        )
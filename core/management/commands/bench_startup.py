@@ -0,0 +1,106 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so every measurement is a cold start
+PROBE = """
+import io, json, sys, time
+start = time.perf_counter()
+
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+application = get_wsgi_application()
+get_resolver().url_patterns
+loaded = time.perf_counter()
+
+# Sign a token outside the timed section so the request reaches the view and
+# its serializer instead of stopping at a 401. The connection is closed again
+# so opening it is still part of the first request.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework_simplejwt.tokens import AccessToken
+users = get_user_model().objects.filter(is_active=True).order_by('id')
+user = users.filter(username=sys.argv[2]).first() if sys.argv[2] else users.first()
+if user is None:
+    sys.exit('No active user to authenticate the probe request with')
+token = str(AccessToken.for_user(user))
+connection.close()
+
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '',
+    'SERVER_NAME': '127.0.0.1', 'SERVER_PORT': '80', 'HTTP_HOST': '127.0.0.1',
+    'HTTP_AUTHORIZATION': f'Bearer {token}',
+    'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+}
+status = []
+request_start = time.perf_counter()
+b''.join(application(environ, lambda s, h, *a: status.append(s)))
+answered = time.perf_counter()
+
+print(json.dumps({
+    'startup': loaded - start,
+    'first_request': answered - request_start,
+    'status': status[0],
+    'modules': len(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Benchmark cold-start import time and time to first request per settings profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+',
+            default=['project_management.settings', 'project_management.settings_api'],
+            help="Settings modules to compare"
+        )
+        parser.add_argument(
+            '--path', default='/api/tasks/',
+            help="Path of the first, authenticated request (default: /api/tasks/)"
+        )
+        parser.add_argument(
+            '--user', default='',
+            help="Username the request is authenticated as (default: the first active user)"
+        )
+        parser.add_argument(
+            '--runs', type=int, default=5,
+            help="Cold starts per profile; the median is reported (default: 5)"
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'profile':<40} {'startup':>10} {'1st req':>10} {'total':>10} {'modules':>8}  status"
+        )
+        for profile in options['profiles']:
+            samples = [
+                self._probe(profile, options['path'], options['user']) for _ in range(options['runs'])
+            ]
+
+            startup = statistics.median(s['startup'] for s in samples) * 1000
+            first_request = statistics.median(s['first_request'] for s in samples) * 1000
+            self.stdout.write(
+                f"{profile:<40} {startup:>8.1f}ms {first_request:>8.1f}ms "
+                f"{startup + first_request:>8.1f}ms {samples[0]['modules']:>8}  {samples[0]['status']}"
+            )
+
+    def _probe(self, profile, path, user):
+        env = os.environ.copy()
+        env['DJANGO_SETTINGS_MODULE'] = profile
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE, path, user],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"{profile} failed to start:\n{result.stderr}")
+        # Django may log to stderr; the measurement is the last stdout line
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        # Never report the timing of an error page as the first request
+        if not sample['status'].startswith('2'):
+            raise CommandError(f"{profile} answered {path} with {sample['status']}:\n{result.stderr}")
+        return sample
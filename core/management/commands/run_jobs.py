@@ -0,0 +1,83 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import claim_jobs, run_job
+from core.models import Job
+
+
+def _init_worker():
+    """
+    Prepares a pool process: sets up Django when the pool uses spawn and
+    drops any database connection inherited from the parent through fork
+    """
+    django.setup()
+    connections.close_all()
+
+
+def _run_job(job_id):
+    try:
+        return job_id, run_job(job_id)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPU cores)"
+        )
+        parser.add_argument(
+            '--batch', type=int, default=None,
+            help="Maximum number of jobs claimed per poll (default: 2 x workers)"
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help="Seconds to wait between polls when the queue is empty"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Process the jobs that are currently due and exit"
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        batch = options['batch'] or workers * 2
+
+        if workers == 1:
+            self._loop(None, batch, options)
+            return
+
+        # Never hand an open connection to forked children
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            self._loop(pool, batch, options)
+
+    def _loop(self, pool, batch, options):
+        self.stdout.write(f"Job worker started (batch={batch})")
+        job_ids = []
+        try:
+            while True:
+                job_ids = claim_jobs(batch)
+                if job_ids:
+                    if pool is None:
+                        results = [_run_job(job_id) for job_id in job_ids]
+                    else:
+                        results = pool.map(_run_job, job_ids)
+                    for job_id, status in results:
+                        self.stdout.write(f"Job #{job_id}: {status}")
+                elif options['once']:
+                    return
+                else:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            # Hand unfinished jobs back right away instead of waiting for their lease to expire
+            Job.objects.filter(id__in=job_ids, status='running').update(status='queued')
+            self.stdout.write("Job worker stopped")
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.reminders import scan_due_tasks
+
+
+class Command(BaseCommand):
+    help = "Record due-soon and overdue notifications for assigned tasks. Run it periodically, e.g. from cron"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window', type=float, default=24,
+            help="Hours ahead in which a task counts as due soon (default: 24)"
+        )
+        parser.add_argument(
+            '--lookback', type=float, default=168,
+            help="Hours back to look for newly overdue tasks (default: 168). "
+                 "Use a larger value once to backfill, keep it above the scan interval"
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Tasks read and notified per query (default: 1000)"
+        )
+
+    def handle(self, *args, **options):
+        counts = scan_due_tasks(
+            window=timedelta(hours=options['window']),
+            lookback=timedelta(hours=options['lookback']),
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(
+            f"Recorded {counts['due_soon']} due-soon and {counts['overdue']} overdue notifications"
+        )
@@ -0,0 +1,122 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import get_resolver
+
+
+def available_cores():
+    """
+    Returns the number of CPU cores this process may run on, respecting
+    CPU affinity (e.g. container cpusets) where the platform exposes it
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_workers():
+    """
+    Gunicorn's recommended (2 x cores) + 1 sync workers
+    """
+    return available_cores() * 2 + 1
+
+
+def preload_application(asgi=False):
+    """
+    Loads Django, the models and the URL router in the calling process so
+    forked workers share them through copy-on-write
+    """
+    if asgi:
+        from project_management.asgi import application
+    else:
+        from project_management.wsgi import application
+
+    # Resolve every URL pattern now rather than on each worker's first request
+    get_resolver().url_patterns
+
+    # Connections must not be shared between forked workers
+    connections.close_all()
+    return application
+
+
+class Command(BaseCommand):
+    help = "Run the API under a multi-process Gunicorn server"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bind', default='127.0.0.1:8000',
+            help="Address to listen on (default: 127.0.0.1:8000)"
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Number of worker processes (default: 2 x available cores + 1)"
+        )
+        parser.add_argument(
+            '--threads', type=int, default=1,
+            help="Threads per worker (default: 1)"
+        )
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help="Serve the ASGI application with Uvicorn workers"
+        )
+        parser.add_argument(
+            '--timeout', type=int, default=30,
+            help="Seconds before a silent worker is killed and restarted"
+        )
+        parser.add_argument(
+            '--graceful-timeout', type=int, default=30,
+            help="Seconds workers get to finish in-flight requests on reload or shutdown"
+        )
+        parser.add_argument(
+            '--max-requests', type=int, default=0,
+            help="Recycle a worker after this many requests (0 disables)"
+        )
+        parser.add_argument(
+            '--no-preload', action='store_true',
+            help="Load the application in each worker instead of before forking"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            raise CommandError("The serve command requires gunicorn: pip install gunicorn")
+
+        if options['asgi']:
+            try:
+                import uvicorn  # noqa: F401
+            except ImportError:
+                raise CommandError("--asgi requires uvicorn: pip install uvicorn")
+
+        preload = not options['no_preload']
+        config = {
+            'bind': options['bind'],
+            'workers': options['workers'] or default_workers(),
+            'threads': options['threads'],
+            'timeout': options['timeout'],
+            'graceful_timeout': options['graceful_timeout'],
+            'max_requests': options['max_requests'],
+            # Spread recycling so workers do not all restart at once
+            'max_requests_jitter': options['max_requests'] // 10,
+            'preload_app': preload,
+            'accesslog': '-',
+        }
+        if options['asgi']:
+            config['worker_class'] = 'uvicorn.workers.UvicornWorker'
+
+        # Gunicorn parses sys.argv on its own, so drive it with an in-process config
+        class DjangoApplication(BaseApplication):
+            def load_config(self):
+                for key, value in config.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return preload_application(asgi=options['asgi'])
+
+        self.stdout.write(
+            f"Serving on {config['bind']} with {config['workers']} workers "
+            f"({'preloaded' if preload else 'per-worker load'}). "
+            "Send SIGHUP to reload workers gracefully."
+        )
+        DjangoApplication().run()
@@ -0,0 +1,118 @@
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accepts_encoding = re.compile(r'([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def compression_setting(name):
+    """
+    Returns a COMPRESSION setting, falling back to the built-in default
+    """
+    defaults = {
+        'MIN_SIZE': 1024,
+        'BROTLI_QUALITY': 4,
+    }
+    return getattr(settings, 'COMPRESSION', {}).get(name, defaults[name])
+
+
+def accepted_encodings(header):
+    """
+    Parses an Accept-Encoding header into {encoding: q-value}
+    """
+    encodings = {}
+    for match in re_accepts_encoding.finditer(header.lower()):
+        try:
+            encodings[match.group(1)] = float(match.group(2) or 1)
+        except ValueError:
+            continue
+    return encodings
+
+
+def choose_encoding(header, allow_brotli=True):
+    """
+    Picks brotli or gzip from an Accept-Encoding header, preferring brotli
+    when the client weighs both equally. Returns None if neither is acceptable.
+    """
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get('*', 0)
+    candidates = ['br', 'gzip'] if brotli and allow_brotli else ['gzip']
+
+    best, best_q = None, 0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli or gzip, negotiated from Accept-Encoding.
+    Responses smaller than COMPRESSION['MIN_SIZE'] are sent as-is, since the
+    CPU cost outweighs the few bytes saved.
+
+    Like Django's GZipMiddleware, gzip output is padded with random bytes to
+    mitigate BREACH. Brotli has no such padding, so HTML (the pages that carry
+    CSRF tokens) is only ever gzipped.
+    """
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''),
+            allow_brotli=not response.get('Content-Type', '').startswith('text/html'),
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            # Streamed bodies have no known size; only gzip supports incremental output here
+            if encoding != 'gzip' or response.is_async:
+                return response
+            response.streaming_content = compress_sequence(
+                response.streaming_content, max_random_bytes=self.max_random_bytes
+            )
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < compression_setting('MIN_SIZE'):
+                return response
+
+            if encoding == 'br':
+                compressed = brotli.compress(
+                    response.content, quality=compression_setting('BROTLI_QUALITY')
+                )
+            else:
+                compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            if len(compressed) >= len(response.content):
+                return response
+
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # The representation changed, so a strong ETag no longer matches it
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = encoding
+        return response
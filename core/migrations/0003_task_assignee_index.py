@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status', 'due_date', 'id'], name='core_task_assignee_idx'),
+        ),
+    ]
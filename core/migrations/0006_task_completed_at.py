@@ -0,0 +1,41 @@
+# Generated by Django 5.1.4 on 2026-10-18 23:06
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+
+def stamp_done_tasks(apps, schema_editor):
+    # When existing tasks were completed is unknown. Estimate it as the later
+    # of their creation and due dates (never in the future), so the existing
+    # backlog can be archived without moving tasks that were active recently.
+    Task = apps.get_model('core', 'Task')
+    Task.objects.filter(status='done').update(completed_at=Least(
+        Greatest('created_at', Coalesce('due_date', 'created_at')),
+        models.Value(timezone.now(), output_field=models.DateTimeField()),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtask',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'completed_at'], name='core_task_status_done_idx'),
+        ),
+        migrations.RunPython(stamp_done_tasks, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 class User(AbstractUser):
@@ -63,6 +64,28 @@ class Task(models.Model):
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     due_date = models.DateTimeField(null=True, blank=True)
+    # Set when the task is marked done and cleared when it is reopened
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Serves the "my work" listing: one user's tasks of one status in (due_date, id) order
+            models.Index(fields=['assigned_to', 'status', 'due_date', 'id'], name='core_task_assignee_idx'),
+            # Serves the due-date scanner's time-window range queries
+            models.Index(fields=['status', 'due_date'], name='core_task_status_due_idx'),
+            # Serves archive_tasks: done tasks completed before a cutoff
+            models.Index(fields=['status', 'completed_at'], name='core_task_status_done_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Stamps completed_at when the task becomes done and clears it when it is reopened
+        """
+        if self.status == 'done' and self.completed_at is None:
+            self.completed_at = timezone.now()
+        elif self.status != 'done':
+            self.completed_at = None
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -77,4 +100,92 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Comment by {self.user.username} on {self.task.title}"
\ No newline at end of file
+        return f"Comment by {self.user.username} on {self.task.title}"
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of the live Task table by `archive_tasks`.
+    Keeps the original id so it can be restored under the same id.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='archived_tasks')
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField()
+    due_date = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+class ArchivedComment(models.Model):
+    """
+    A comment of an archived task, keeping its original id
+    """
+    id = models.BigIntegerField(primary_key=True)
+    content = models.TextField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name='comments')
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Comment by {self.user.username} on {self.task.title}"
+
+class Notification(models.Model):
+    """
+    Represents a due-date reminder sent to a task's assignee
+    """
+    KIND_CHOICES = [
+        ('due_soon', 'Due Soon'),
+        ('overdue', 'Overdue')
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # A task is notified at most once per kind, even if scans overlap
+            models.UniqueConstraint(fields=['task', 'kind'], name='core_notification_once'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.task.title}"
+
+class Job(models.Model):
+    """
+    Represents a unit of background work processed by the `run_jobs` worker
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed')
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='core_job_status_run_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
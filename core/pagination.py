@@ -0,0 +1,129 @@
+import heapq
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from itertools import islice
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class DueDateCursorPagination(BasePagination):
+    """
+    Keyset pagination over tasks ordered by (due_date, id), with tasks that
+    have no due date last.
+
+    Takes one queryset or a list of querysets whose union is paginated, e.g.
+    one per status, so that each can be read as a single index range in
+    (due_date, id) order. Every page reads at most page_size + 1 rows from
+    each queryset, starting right after the cursor, and merges them. Dated
+    and undated tasks are read with separate queries so that neither needs
+    an OR that would stop the index from bounding the scan.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, task):
+        due = task.due_date.isoformat() if task.due_date else ''
+        return urlsafe_b64encode(f'{due}|{task.id}'.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            due, _, task_id = urlsafe_b64decode(cursor.encode()).decode().partition('|')
+            return (datetime.fromisoformat(due) if due else None), int(task_id)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        querysets = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+        # One extra row tells whether there is a next page
+        limit = self.page_size + 1
+
+        due, task_id = None, None
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            due, task_id = self.decode_cursor(cursor)
+
+        rows = []
+        # A cursor without a due date points into the undated section
+        if task_id is None or due is not None:
+            rows = self.merge(
+                [self.dated_range(qs, due, task_id)[:limit] for qs in querysets],
+                key=lambda task: (task.due_date, task.id),
+                limit=limit,
+            )
+
+        if len(rows) < limit:
+            after_id = task_id if due is None and task_id is not None else 0
+            remaining = limit - len(rows)
+            rows += self.merge(
+                [qs.filter(due_date__isnull=True, id__gt=after_id).order_by('id')[:remaining]
+                 for qs in querysets],
+                key=lambda task: task.id,
+                limit=remaining,
+            )
+
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def dated_range(self, queryset, due, task_id):
+        """
+        Tasks with a due date after the cursor, as a range the index can seek to:
+        due_date >= cursor date, minus the rows at that date already served
+        """
+        queryset = queryset.filter(due_date__isnull=False)
+        if due is not None:
+            queryset = queryset.filter(due_date__gte=due).exclude(due_date=due, id__lte=task_id)
+        return queryset.order_by('due_date', 'id')
+
+    def merge(self, querysets, key, limit):
+        """
+        Merges individually ordered querysets into the first `limit` rows
+        """
+        return list(islice(heapq.merge(*querysets, key=key), limit))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """
+    Cursor pagination by descending id, i.e. newest rows first
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
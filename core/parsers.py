@@ -0,0 +1,40 @@
+import re
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson reads integers beyond 64 bits as floats; numbers this long go to the stdlib parser
+re_long_number = re.compile(rb'\d{19,}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser backed by orjson when it is installed, otherwise DRF's stdlib parser
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        # orjson only reads UTF-8 and always rejects NaN/Infinity
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if re_long_number.search(body):
+            return super().parse(BytesIO(body), media_type, parser_context)
+
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,88 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Task, Notification
+
+OPEN_STATUSES = ['todo', 'in_progress']
+
+
+def tasks_due_between(start, end, chunk_size):
+    """
+    Yields chunks of (task_id, assignee_id) for open, assigned tasks whose
+    due date falls in (start, end]. Tasks that were already notified are
+    included; record_notifications skips them.
+    Each status is walked as its own range of the (status, due_date) index in
+    (due_date, id) order. A chunk starts at the due date of the previous
+    chunk's last row, minus the rows at that date already read, so no chunk
+    rescans earlier rows.
+    """
+    for value in OPEN_STATUSES:
+        queryset = Task.objects.filter(
+            status=value,
+            due_date__lte=end,
+            assigned_to__isnull=False,
+        ).order_by('due_date', 'id')
+
+        chunk_queryset = queryset.filter(due_date__gt=start)
+        while True:
+            rows = list(chunk_queryset.values_list('id', 'assigned_to_id', 'due_date')[:chunk_size])
+            if not rows:
+                break
+            yield [(task_id, assignee_id) for task_id, assignee_id, _ in rows]
+
+            last_id, _, last_due = rows[-1]
+            chunk_queryset = queryset.filter(due_date__gte=last_due).exclude(due_date=last_due, id__lte=last_id)
+
+
+def record_notifications(kind, rows):
+    """
+    Inserts notifications for a chunk of tasks, skipping tasks that were
+    already notified. The unique (task, kind) constraint catches tasks
+    notified by a scan running at the same time.
+    Returns the number of notifications actually created.
+    """
+    task_ids = [task_id for task_id, _ in rows]
+    notified = Notification.objects.filter(task_id__in=task_ids, kind=kind)
+    already_notified = set(notified.values_list('task_id', flat=True))
+    new = [
+        Notification(task_id=task_id, user_id=assignee_id, kind=kind)
+        for task_id, assignee_id in rows
+        if task_id not in already_notified
+    ]
+    try:
+        with transaction.atomic():
+            Notification.objects.bulk_create(new)
+        return len(new)
+    except IntegrityError:
+        pass
+
+    # A concurrent scan notified some of these tasks since they were read.
+    # Insert one by one so only the notifications created here are counted.
+    created = 0
+    for notification in new:
+        try:
+            with transaction.atomic():
+                notification.save()
+            created += 1
+        except IntegrityError:
+            pass
+    return created
+
+
+def scan_due_tasks(window, lookback, chunk_size=1000, now=None):
+    """
+    Records 'due_soon' notifications for tasks due within `window` and
+    'overdue' notifications for tasks that became overdue within `lookback`.
+    Both are timedeltas; bounding the overdue range keeps each scan
+    proportional to recent activity rather than the size of the table.
+    """
+    now = now or timezone.now()
+    counts = {'due_soon': 0, 'overdue': 0}
+
+    for rows in tasks_due_between(now, now + window, chunk_size):
+        counts['due_soon'] += record_notifications('due_soon', rows)
+
+    for rows in tasks_due_between(now - lookback, now, chunk_size):
+        counts['overdue'] += record_notifications('overdue', rows)
+
+    return counts
@@ -1,6 +1,16 @@
 from rest_framework import serializers
-from .models import User, Project, ProjectMember, Task, Comment
+from .models import (
+    User, Project, ProjectMember, Task, Comment,
+    ArchivedTask, ArchivedComment, Notification, Job
+)
 from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from itertools import islice
+
+# Rows per INSERT when adding members or copying a project
+BATCH_SIZE = 500
+# Times a bulk membership insert is retried after losing a race with another request
+BULK_MEMBER_ATTEMPTS = 3
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
@@ -92,6 +102,136 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         
         return ProjectMember.objects.create(**validated_data)
 
+def bulk_create_in_batches(model, objs, batch_size):
+    """
+    Inserts objects from an iterable batch by batch, so large copies are
+    never held in memory at once (bulk_create materialises its input)
+    """
+    objs = iter(objs)
+    while batch := list(islice(objs, batch_size)):
+        model.objects.bulk_create(batch)
+
+class BulkMemberEntrySerializer(serializers.Serializer):
+    """
+    A single entry of a bulk membership request. Users are plain ids here and
+    are resolved for the whole batch at once in BulkProjectMemberSerializer.
+    """
+    user = serializers.IntegerField()
+    role = serializers.ChoiceField(choices=ProjectMember.ROLE_CHOICES, default='member')
+
+class BulkProjectMemberSerializer(serializers.Serializer):
+    """
+    Adds many members to a project with a fixed number of queries
+    """
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    members = BulkMemberEntrySerializer(many=True, allow_empty=False)
+
+    def create(self, validated_data):
+        """
+        Resolves all users in one query and inserts the new memberships with
+        bulk INSERTs. Returns the added and skipped entries.
+        """
+        project = validated_data['project']
+        entries = validated_data['members']
+        requested_ids = {entry['user'] for entry in entries}
+
+        existing_users = set(
+            User.objects.filter(id__in=requested_ids).values_list('id', flat=True)
+        )
+
+        for attempt in range(BULK_MEMBER_ATTEMPTS):
+            current_members = set(
+                ProjectMember.objects.filter(
+                    project=project, user_id__in=existing_users
+                ).values_list('user_id', flat=True)
+            )
+            added, skipped = self.partition(entries, existing_users, current_members)
+            try:
+                with transaction.atomic():
+                    ProjectMember.objects.bulk_create(
+                        [ProjectMember(project=project, user_id=entry['user'], role=entry['role']) for entry in added],
+                        batch_size=BATCH_SIZE,
+                    )
+            except IntegrityError:
+                # Another request added some of these users since they were read;
+                # the whole insert was rolled back, so re-read and try again
+                if attempt == BULK_MEMBER_ATTEMPTS - 1:
+                    raise
+                continue
+            return {'project': project.id, 'added': added, 'skipped': skipped}
+
+    def partition(self, entries, existing_users, current_members):
+        """
+        Splits the entries into memberships to insert and skipped entries
+        """
+        added, skipped, seen = [], [], set()
+        for entry in entries:
+            user_id = entry['user']
+            if user_id in seen:
+                skipped.append({'user': user_id, 'reason': 'duplicate'})
+            elif user_id not in existing_users:
+                skipped.append({'user': user_id, 'reason': 'unknown_user'})
+            elif user_id in current_members:
+                skipped.append({'user': user_id, 'reason': 'already_member'})
+            else:
+                added.append({'user': user_id, 'role': entry['role']})
+            seen.add(user_id)
+        return added, skipped
+
+class ProjectCloneSerializer(serializers.Serializer):
+    """
+    Copies a project, optionally with its members and tasks, into a new project
+    """
+    name = serializers.CharField(max_length=200, required=False)
+    include_members = serializers.BooleanField(
+        default=True, help_text="Copy the members; the new owner joins the copy as its admin"
+    )
+    include_tasks = serializers.BooleanField(default=True)
+    reset_status = serializers.BooleanField(
+        default=False, help_text="Set every copied task back to 'todo', e.g. when using the project as a template"
+    )
+
+    def create(self, validated_data):
+        """
+        Creates the copy owned by `owner`, inserting members and tasks in batches
+        """
+        source = validated_data['source']
+        batch_size = BATCH_SIZE
+
+        with transaction.atomic():
+            project = Project.objects.create(
+                name=validated_data.get('name') or f"{source.name} (copy)",
+                description=source.description,
+                owner=validated_data['owner'],
+            )
+
+            if validated_data['include_members']:
+                # The owner is added as admin whatever their role in the source
+                ProjectMember.objects.create(project=project, user=project.owner, role='admin')
+                members = ProjectMember.objects.filter(project=source).exclude(
+                    user=project.owner
+                ).values_list('user_id', 'role')
+                bulk_create_in_batches(
+                    ProjectMember,
+                    (ProjectMember(project=project, user_id=user_id, role=role)
+                     for user_id, role in members.iterator(chunk_size=batch_size)),
+                    batch_size,
+                )
+
+            if validated_data['include_tasks']:
+                tasks = Task.objects.filter(project=source).order_by('id').values(
+                    'title', 'description', 'status', 'priority', 'assigned_to_id', 'due_date', 'completed_at'
+                )
+                overrides = {'status': 'todo', 'completed_at': None} if validated_data['reset_status'] else {}
+                bulk_create_in_batches(
+                    Task,
+                    (Task(project=project, **{**task, **overrides})
+                     for task in tasks.iterator(chunk_size=batch_size)),
+                    batch_size,
+                )
+
+        return project
+
 class TaskSerializer(serializers.ModelSerializer):
     assigned_to = UserSerializer(read_only=True)
     project = serializers.PrimaryKeyRelatedField(
@@ -102,8 +242,8 @@ class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ['id', 'title', 'description', 'status', 'priority', 
-                  'project', 'assigned_to', 'created_at', 'due_date']
-        read_only_fields = ['id', 'created_at']
+                  'project', 'assigned_to', 'created_at', 'due_date', 'completed_at']
+        read_only_fields = ['id', 'created_at', 'completed_at']
 
     def create(self, validated_data):
         """
@@ -135,4 +275,38 @@ class CommentSerializer(serializers.ModelSerializer):
         if 'task' not in validated_data:
             raise serializers.ValidationError("A task must be specified when creating a comment.")
         
-        return Comment.objects.create(**validated_data)
\ No newline at end of file
+        return Comment.objects.create(**validated_data)
+
+class ArchivedTaskSerializer(TaskSerializer):
+    """
+    Read-only representation of an archived task, shaped like TaskSerializer
+    """
+    class Meta:
+        model = ArchivedTask
+        fields = TaskSerializer.Meta.fields + ['archived_at']
+        read_only_fields = fields
+
+class ArchivedCommentSerializer(CommentSerializer):
+    """
+    Read-only representation of a comment on an archived task
+    """
+    class Meta:
+        model = ArchivedComment
+        fields = CommentSerializer.Meta.fields
+        read_only_fields = fields
+
+class NotificationSerializer(serializers.ModelSerializer):
+    task_title = serializers.CharField(source='task.title', read_only=True)
+    due_date = serializers.DateTimeField(source='task.due_date', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'kind', 'task', 'task_title', 'due_date', 'created_at', 'read_at']
+        read_only_fields = fields
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'kind', 'payload', 'status', 'result', 'error',
+                  'attempts', 'max_attempts', 'created_at', 'updated_at']
+        read_only_fields = fields
\ No newline at end of file
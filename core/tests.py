@@ -1,3 +1,595 @@
-from django.test import TestCase
+import gzip
+import json
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .archive import archive_done_tasks
+from .jobs import JOB_HANDLERS, claim_jobs, enqueue, register, run_job, touch, LeaseLost
+from .middleware import CompressionMiddleware, brotli, choose_encoding
+from .models import User, Project, ProjectMember, Task, Comment, ArchivedTask, Notification, Job
+from .pagination import DueDateCursorPagination
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .reminders import record_notifications, scan_due_tasks, tasks_due_between
+from .serializers import BulkProjectMemberSerializer
+
+
+class DueDateCursorTests(TestCase):
+    def setUp(self):
+        self.paginator = DueDateCursorPagination()
+
+    def test_cursor_roundtrip(self):
+        due = timezone.now().replace(microsecond=123456)
+        task = Task(id=42, due_date=due)
+        self.assertEqual(self.paginator.decode_cursor(self.paginator.encode_cursor(task)), (due, 42))
+
+    def test_cursor_without_due_date(self):
+        task = Task(id=7, due_date=None)
+        self.assertEqual(self.paginator.decode_cursor(self.paginator.encode_cursor(task)), (None, 7))
+
+    def test_invalid_cursor(self):
+        for cursor in ['not-a-cursor', 'eHx5', '']:
+            with self.assertRaises(NotFound):
+                self.paginator.decode_cursor(cursor)
+
+
+class MyTasksTests(TestCase):
+    url = '/api/tasks/mine/'
+
+    def setUp(self):
+        self.user = User.objects.create(username='me', email='me@example.com')
+        other = User.objects.create(username='other', email='other@example.com')
+        self.alpha = Project.objects.create(name='Alpha', owner=self.user)
+        self.beta = Project.objects.create(name='Beta', owner=self.user)
+
+        now = timezone.now()
+        self.tasks = []
+        for i, (status, days, project) in enumerate([
+            ('todo', 3, self.alpha), ('in_progress', 1, self.beta), ('todo', 1, self.alpha),
+            ('in_progress', None, self.alpha), ('todo', 2, self.beta), ('todo', None, self.beta),
+            ('in_progress', 2, self.alpha), ('done', 0, self.alpha),
+        ]):
+            self.tasks.append(Task.objects.create(
+                title=f'Task {i}', status=status, project=project, assigned_to=self.user,
+                due_date=now + timedelta(days=days) if days is not None else None,
+            ))
+        # Shares a due date with tasks 1 and 2, so the tie is broken by id
+        self.tasks.append(Task.objects.create(
+            title='Task 8', status='todo', project=self.beta, assigned_to=self.user,
+            due_date=self.tasks[1].due_date,
+        ))
+        Task.objects.create(title='Not mine', status='todo', project=self.alpha, assigned_to=other, due_date=now)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def expected_ids(self, statuses=('todo', 'in_progress')):
+        tasks = [task for task in self.tasks if task.status in statuses]
+        dated = sorted((task for task in tasks if task.due_date), key=lambda task: (task.due_date, task.id))
+        undated = sorted((task for task in tasks if not task.due_date), key=lambda task: task.id)
+        return [task.id for task in dated + undated]
+
+    def walk(self, **params):
+        ids, pages = [], 0
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            ids += [task['id'] for task in response.data['results']]
+            pages += 1
+            if not response.data['next']:
+                return ids, pages
+            params['cursor'] = parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+
+    def test_pages_follow_due_date_with_undated_last(self):
+        for page_size in [1, 2, 3, 50]:
+            ids, _ = self.walk(page_size=page_size)
+            self.assertEqual(ids, self.expected_ids())
+
+    def test_single_status(self):
+        ids, _ = self.walk(page_size=2, status='done')
+        self.assertEqual(ids, self.expected_ids(['done']))
+
+    def test_project_filter(self):
+        ids, _ = self.walk(page_size=2, project_id=self.beta.id)
+        beta_ids = set(Task.objects.filter(project=self.beta).values_list('id', flat=True))
+        self.assertEqual(ids, [task_id for task_id in self.expected_ids() if task_id in beta_ids])
+
+    def test_exact_page_has_no_next(self):
+        _, pages = self.walk(page_size=len(self.expected_ids()))
+        self.assertEqual(pages, 1)
+
+    def test_invalid_status(self):
+        response = self.client.get(self.url, {'status': 'todo,nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_project_id(self):
+        response = self.client.get(self.url, {'project_id': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_group_by_project(self):
+        response = self.client.get(self.url, {'group_by': 'project', 'page_size': 4})
+        self.assertEqual(response.status_code, 200)
+        page = self.expected_ids()[:4]
+        groups = response.data['results']
+
+        # Projects appear in the order of their earliest task on the page
+        first_project = Task.objects.get(id=page[0]).project
+        self.assertEqual(groups[0]['project'], {'id': first_project.id, 'name': first_project.name})
+        self.assertEqual(
+            sorted(task['id'] for group in groups for task in group['tasks']), sorted(page)
+        )
+        for group in groups:
+            self.assertTrue(all(task['project'] == group['project']['id'] for task in group['tasks']))
+
+
+class ScanDueTasksTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = User.objects.create(username='me', email='me@example.com')
+        project = Project.objects.create(name='Alpha', owner=self.user)
+
+        def task(status, hours, assigned_to=self.user):
+            return Task.objects.create(
+                title='Task', status=status, project=project, assigned_to=assigned_to,
+                due_date=self.now + timedelta(hours=hours),
+            )
+
+        # Three share a due date so chunks have to continue inside a tie
+        self.due_soon = [task('todo', 2), task('todo', 2), task('in_progress', 2), task('todo', 5)]
+        self.overdue = [task('in_progress', -3), task('todo', -1)]
+        task('done', 2)
+        task('todo', 2, assigned_to=None)
+        task('todo', 48)
+        task('todo', -400)
+
+    def scan(self, chunk_size):
+        return scan_due_tasks(timedelta(hours=24), timedelta(hours=168), chunk_size=chunk_size, now=self.now)
+
+    def test_chunks_cover_every_task_once(self):
+        for chunk_size in [1, 2, 100]:
+            chunks = list(tasks_due_between(self.now, self.now + timedelta(hours=24), chunk_size))
+            task_ids = [task_id for chunk in chunks for task_id, _ in chunk]
+            self.assertEqual(sorted(task_ids), sorted(task.id for task in self.due_soon))
+
+    def test_scan_counts_created_notifications(self):
+        self.assertEqual(self.scan(chunk_size=2), {'due_soon': 4, 'overdue': 2})
+        self.assertEqual(self.scan(chunk_size=2), {'due_soon': 0, 'overdue': 0})
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 6)
+
+    def test_record_notifications_skips_concurrent_inserts(self):
+        rows = [(task.id, self.user.id) for task in self.due_soon]
+        atomic = transaction.atomic
+
+        def racing_atomic(*args, **kwargs):
+            # Another scan notifies one of the tasks after this one read the chunk,
+            # outside the savepoint that the insert runs in
+            if not Notification.objects.filter(task=self.due_soon[0]).exists():
+                Notification.objects.create(task=self.due_soon[0], user=self.user, kind='due_soon')
+            return atomic(*args, **kwargs)
+
+        with mock.patch.object(transaction, 'atomic', side_effect=racing_atomic):
+            self.assertEqual(record_notifications('due_soon', rows), 3)
+        self.assertEqual(Notification.objects.filter(kind='due_soon').count(), 4)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='me', email='me@example.com')
+        self.project = Project.objects.create(name='Alpha', owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_completed_at_follows_status(self):
+        task = Task.objects.create(title='Task', project=self.project)
+        self.assertIsNone(task.completed_at)
+        task.status = 'done'
+        task.save()
+        completed_at = task.completed_at
+        self.assertIsNotNone(completed_at)
+        task.save()
+        self.assertEqual(task.completed_at, completed_at)
+        task.status = 'todo'
+        task.save()
+        self.assertIsNone(task.completed_at)
+
+    def test_archives_by_completion_date(self):
+        old = timezone.now() - timedelta(days=400)
+        stale = Task.objects.create(title='Stale', status='done', project=self.project)
+        Comment.objects.create(content='Note', user=self.user, task=stale)
+        # Created long ago but only just completed
+        recent = Task.objects.create(title='Recent', status='done', project=self.project)
+        Task.objects.filter(id=stale.id).update(completed_at=old, created_at=old)
+        Task.objects.filter(id=recent.id).update(created_at=old)
+
+        counts = archive_done_tasks(timezone.now() - timedelta(days=365), chunk_size=1)
+        self.assertEqual(counts, {'tasks': 1, 'comments': 1})
+        self.assertEqual(list(ArchivedTask.objects.values_list('id', 'completed_at')), [(stale.id, old)])
+        self.assertTrue(Task.objects.filter(id=recent.id).exists())
+
+        response = self.client.post(f'/api/tasks/{stale.id}/restore/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(id=stale.id).completed_at, old)
+        self.assertEqual(Comment.objects.filter(task_id=stale.id).count(), 1)
+
+    def test_invalid_id(self):
+        for pk in ['abc', '999999']:
+            self.assertEqual(self.client.post(f'/api/tasks/{pk}/restore/').status_code, 404)
+            response = self.client.get(f'/api/tasks/{pk}/', {'include_archived': 'true'})
+            self.assertEqual(response.status_code, 404)
+
+    def test_include_archived_requires_filter(self):
+        self.assertEqual(self.client.get('/api/tasks/', {'include_archived': 'true'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/comments/', {'include_archived': 'true'}).status_code, 400)
+        response = self.client.get('/api/tasks/', {'include_archived': 'true', 'project_id': self.project.id})
+        self.assertEqual(response.status_code, 200)
+
+
+@register('test_job')
+def _test_job(job):
+    return JobTests.handler(job)
+
+
+def _failing_job(job):
+    raise RuntimeError('boom')
+
+
+@override_settings(JOB_QUEUE={'MAX_ATTEMPTS': 2, 'RETRY_DELAY': 30, 'DELETE_THRESHOLD': 3, 'LEASE_TIMEOUT': 60})
+class JobTests(TestCase):
+    handler = None
+
+    def setUp(self):
+        self.user = User.objects.create(username='me', email='me@example.com')
+        self.project = Project.objects.create(name='Alpha', owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def claim_and_run(self, handler):
+        JobTests.handler = staticmethod(handler)
+        job_ids = claim_jobs(10)
+        self.assertEqual(len(job_ids), 1)
+        return run_job(job_ids[0]), Job.objects.get(pk=job_ids[0])
+
+    def test_small_project_is_deleted_inline(self):
+        Task.objects.create(title='Task', project=self.project)
+        response = self.client.delete(f'/api/projects/{self.project.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Project.objects.exists())
+
+    def test_large_project_is_deleted_by_one_job(self):
+        for i in range(3):
+            task = Task.objects.create(title=f'Task {i}', project=self.project)
+            Comment.objects.create(content='Note', user=self.user, task=task)
+        ProjectMember.objects.create(project=self.project, user=self.user, role='admin')
+
+        first = self.client.delete(f'/api/projects/{self.project.id}/')
+        second = self.client.delete(f'/api/projects/{self.project.id}/')
+        self.assertEqual((first.status_code, second.status_code), (202, 202))
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(Job.objects.count(), 1)
+
+        with override_settings(JOB_QUEUE={'CHUNK_SIZE': 2}):
+            self.assertEqual(claim_jobs(10), [first.data['id']])
+            self.assertEqual(run_job(first.data['id']), 'done')
+        job = Job.objects.get(pk=first.data['id'])
+        self.assertEqual(job.result, {
+            'comments': 3, 'tasks': 3, 'members': 1,
+            'archived_comments': 0, 'archived_tasks': 0, 'projects': 1,
+        })
+        self.assertFalse(Project.objects.exists())
+
+    def test_failure_is_retried_with_backoff_then_fails(self):
+        enqueue('test_job')
+        before = timezone.now()
+        status, job = self.claim_and_run(_failing_job)
+        self.assertEqual((status, job.status, job.attempts), ('queued', 'queued', 1))
+        self.assertEqual(job.error, 'RuntimeError: boom')
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=30))
+
+        # Not due again until the backoff has passed
+        self.assertEqual(claim_jobs(10), [])
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        status, job = self.claim_and_run(_failing_job)
+        self.assertEqual((status, job.status, job.attempts), ('failed', 'failed', 2))
+
+    def test_expired_lease_is_reclaimed(self):
+        enqueue('test_job')
+        self.assertEqual(len(claim_jobs(10)), 1)
+        stale = Job.objects.get(kind='test_job')
+        Job.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(seconds=61))
+
+        # Another worker takes the job over; the first one no longer owns it
+        status, job = self.claim_and_run(lambda job: {'ok': True})
+        self.assertEqual((status, job.attempts, job.result), ('done', 2, {'ok': True}))
+        with self.assertRaises(LeaseLost):
+            touch(stale)
+
+    def test_expired_lease_fails_after_max_attempts(self):
+        job = enqueue('test_job')
+        Job.objects.filter(pk=job.pk).update(
+            status='running', attempts=2, updated_at=timezone.now() - timedelta(seconds=61)
+        )
+        self.assertEqual(claim_jobs(10), [])
+        self.assertEqual(Job.objects.get(pk=job.pk).status, 'failed')
+
+    def test_reclaimed_job_does_not_record_its_result(self):
+        def reclaimed_while_running(job):
+            # Another worker reclaims and claims the job meanwhile
+            Job.objects.filter(pk=job.pk).update(attempts=F('attempts') + 1)
+            return {'ok': True}
+
+        def reclaimed_before_touch(job):
+            reclaimed_while_running(job)
+            touch(job)
+
+        enqueue('test_job')
+        status, job = self.claim_and_run(reclaimed_while_running)
+        self.assertEqual((status, job.status, job.result), ('lost', 'running', None))
+
+        Job.objects.filter(pk=job.pk).update(status='queued')
+        status, job = self.claim_and_run(reclaimed_before_touch)
+        self.assertEqual((status, job.status, job.result), ('lost', 'running', None))
+
+    def test_export_renews_its_lease(self):
+        for i in range(3):
+            Task.objects.create(title=f'Task {i}', project=self.project, status='done')
+        response = self.client.post(f'/api/projects/{self.project.id}/export/')
+        self.assertEqual(response.status_code, 202)
+
+        with override_settings(JOB_QUEUE={'CHUNK_SIZE': 2}), mock.patch('core.jobs.touch') as touched:
+            claim_jobs(10)
+            self.assertEqual(run_job(response.data['id']), 'done')
+        self.assertEqual(touched.call_count, 1)
+        tasks = Job.objects.get(pk=response.data['id']).result['tasks']
+        self.assertEqual(len(tasks), 3)
+        self.assertTrue(all(task['completed_at'] for task in tasks))
+
+
+@override_settings(COMPRESSION={'MIN_SIZE': 100})
+class CompressionTests(TestCase):
+    body = json.dumps([{'id': i, 'title': f'Task {i}'} for i in range(50)]).encode()
+
+    def respond(self, accept_encoding, body=None, content_type='application/json', **headers):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        response = HttpResponse(self.body if body is None else body, content_type=content_type, headers=headers)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding(self):
+        best = 'br' if brotli else 'gzip'
+        for header, expected in [
+            ('', None),
+            ('identity', None),
+            ('gzip', 'gzip'),
+            ('gzip, br', best),
+            ('br;q=0.5, gzip', 'gzip'),
+            ('gzip;q=0, br', 'br' if brotli else None),
+            ('gzip;q=0', None),
+            ('*', best),
+            ('*;q=0.1, gzip;q=0.5', 'gzip'),
+            ('*, gzip;q=0, br;q=0', None),
+            ('GZIP;Q=0.8', 'gzip'),
+        ]:
+            self.assertEqual(choose_encoding(header), expected, header)
+        self.assertEqual(choose_encoding('br, gzip;q=0.5', allow_brotli=False), 'gzip')
+
+    def test_gzip(self):
+        response = self.respond('gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+    def test_gzip_is_padded(self):
+        # The random padding changes the compressed length between responses (BREACH)
+        sizes = {len(self.respond('gzip').content) for _ in range(10)}
+        self.assertGreater(len(sizes), 1)
+
+    def test_brotli(self):
+        if brotli is None:
+            self.skipTest('brotli is not installed')
+        response = self.respond('br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+
+    def test_html_is_never_brotli(self):
+        response = self.respond('br, gzip', body=b'<p>' * 100, content_type='text/html')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        response = self.respond('br', body=b'<p>' * 100, content_type='text/html; charset=utf-8')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.respond('gzip', body=b'{"id": 1}')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{"id": 1}')
+
+    def test_not_acceptable(self):
+        response = self.respond('gzip;q=0, br;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_already_encoded(self):
+        response = self.respond('gzip', **{'Content-Encoding': 'identity'})
+        self.assertEqual(response.content, self.body)
+
+    def test_etag_is_weakened(self):
+        response = self.respond('gzip', ETag='"abc"')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        response = self.respond('gzip', ETag='W/"abc"')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_streaming_gzip(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br, gzip')
+        response = StreamingHttpResponse([self.body[:100], self.body[100:]])
+        response = CompressionMiddleware(lambda request: response)(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.body)
+
+
+class FastJSONTests(TestCase):
+    data = {'title': 'Caf\u00e9 \u2028', 'count': 3, 'due': timezone.now(), 'nested': [1.5, None, True]}
+
+    def assertRendersLikeStdlib(self, data, accepted_media_type=None, renderer_context=None, **attrs):
+        fast, stdlib = FastJSONRenderer(), JSONRenderer()
+        for renderer in (fast, stdlib):
+            for name, value in attrs.items():
+                setattr(renderer, name, value)
+        self.assertEqual(
+            fast.render(data, accepted_media_type, renderer_context),
+            stdlib.render(data, accepted_media_type, renderer_context),
+        )
+
+    def test_renders_like_stdlib(self):
+        self.assertRendersLikeStdlib(self.data)
+        self.assertRendersLikeStdlib(None)
+
+    def test_indent_falls_back(self):
+        self.assertRendersLikeStdlib(self.data, 'application/json; indent=4')
+        self.assertRendersLikeStdlib(self.data, renderer_context={'indent': 2})
+
+    def test_ensure_ascii_falls_back(self):
+        self.assertRendersLikeStdlib(self.data, ensure_ascii=True)
+
+    def test_big_integers_fall_back(self):
+        self.assertRendersLikeStdlib({'big': 2 ** 70, 'negative': -2 ** 70})
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        body = '{"title": "Caf\u00e9", "ids": [1, 2], "ratio": 0.5}'.encode()
+        self.assertEqual(parser.parse(BytesIO(body)), {'title': 'Caf\u00e9', 'ids': [1, 2], 'ratio': 0.5})
+
+    def test_parser_big_integers_fall_back(self):
+        # orjson would read these as floats and lose precision
+        body = f'{{"big": {2 ** 70 + 1}, "negative": {-2 ** 64 - 1}}}'.encode()
+        parsed = FastJSONParser().parse(BytesIO(body))
+        self.assertEqual(parsed, {'big': 2 ** 70 + 1, 'negative': -2 ** 64 - 1})
+        self.assertIsInstance(parsed['big'], int)
+
+    def test_parser_rejects_invalid_json(self):
+        for body in [b'{"title": ', b'{"value": NaN}']:
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(body))
+
+    def test_parser_non_utf8(self):
+        body = '{"title": "Caf\u00e9"}'.encode('latin-1')
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body), parser_context={'encoding': 'latin-1'}),
+            {'title': 'Caf\u00e9'},
+        )
+
+
+class BulkMembershipTests(TestCase):
+    url = '/api/project-members/bulk/'
+
+    def setUp(self):
+        self.user = User.objects.create(username='me', email='me@example.com')
+        self.users = [User.objects.create(username=f'user{i}', email=f'user{i}@example.com') for i in range(3)]
+        self.project = Project.objects.create(name='Alpha', owner=self.user)
+        ProjectMember.objects.create(project=self.project, user=self.users[0])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, *user_ids):
+        return self.client.post(self.url, {
+            'project': self.project.id,
+            'members': [{'user': user_id, 'role': 'admin' if i == 0 else 'member'} for i, user_id in enumerate(user_ids)],
+        }, format='json')
+
+    def test_added_and_skipped(self):
+        first, second, third = (user.id for user in self.users)
+        response = self.post(second, first, 999999, third, second)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['added'], [
+            {'user': second, 'role': 'admin'}, {'user': third, 'role': 'member'},
+        ])
+        self.assertEqual(response.data['skipped'], [
+            {'user': first, 'reason': 'already_member'},
+            {'user': 999999, 'reason': 'unknown_user'},
+            {'user': second, 'reason': 'duplicate'},
+        ])
+        self.assertEqual(
+            dict(ProjectMember.objects.filter(project=self.project).values_list('user_id', 'role')),
+            {first: 'member', second: 'admin', third: 'member'},
+        )
+
+    def test_nothing_added(self):
+        response = self.post(self.users[0].id, 999999)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['added'], [])
+
+    def test_retries_after_a_concurrent_insert(self):
+        partition = BulkProjectMemberSerializer.partition
+        second, third = self.users[1].id, self.users[2].id
+
+        def racing(serializer, *args):
+            result = partition(serializer, *args)
+            if not ProjectMember.objects.filter(user_id=second).exists():
+                # Another request adds one of the users after the membership read
+                ProjectMember.objects.create(project=self.project, user_id=second)
+            return result
+
+        with mock.patch.object(BulkProjectMemberSerializer, 'partition', racing):
+            response = self.post(second, third)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['added'], [{'user': third, 'role': 'member'}])
+        self.assertEqual(response.data['skipped'], [{'user': second, 'reason': 'already_member'}])
+
+
+class ProjectCloneTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='me', email='me@example.com')
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.member = User.objects.create(username='member', email='member@example.com')
+        self.source = Project.objects.create(name='Alpha', description='Source', owner=owner)
+        ProjectMember.objects.create(project=self.source, user=owner, role='admin')
+        ProjectMember.objects.create(project=self.source, user=self.member, role='member')
+        ProjectMember.objects.create(project=self.source, user=self.user, role='member')
+        Task.objects.create(title='Open', project=self.source, assigned_to=self.member)
+        Task.objects.create(title='Done', project=self.source, status='done')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def clone(self, **data):
+        response = self.client.post(f'/api/projects/{self.source.id}/clone/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Project.objects.get(pk=response.data['id'])
+
+    def test_clone_everything(self):
+        copy = self.clone()
+        self.assertEqual((copy.name, copy.description, copy.owner), ('Alpha (copy)', 'Source', self.user))
+        self.assertEqual(
+            dict(copy.members.values_list('user__username', 'role')),
+            {'me': 'admin', 'owner': 'admin', 'member': 'member'},
+        )
+        self.assertEqual(
+            sorted(copy.tasks.values_list('title', 'status', 'assigned_to')),
+            [('Done', 'done', None), ('Open', 'todo', self.member.id)],
+        )
+        self.assertIsNotNone(copy.tasks.get(title='Done').completed_at)
+
+    def test_clone_without_members_or_tasks(self):
+        copy = self.clone(name='Empty', include_members=False, include_tasks=False)
+        self.assertEqual(copy.name, 'Empty')
+        self.assertFalse(copy.members.exists())
+        self.assertFalse(copy.tasks.exists())
+
+    def test_clone_with_reset_status(self):
+        copy = self.clone(include_members=False, reset_status=True)
+        self.assertEqual(
+            sorted(copy.tasks.values_list('title', 'status', 'completed_at')),
+            [('Done', 'todo', None), ('Open', 'todo', None)],
+        )
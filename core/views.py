@@ -1,14 +1,31 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
-from .models import User, Project, ProjectMember, Task, Comment
+from .schema import extend_schema, OpenApiParameter, OpenApiTypes
+from .models import (
+    User, Project, ProjectMember, Task, Comment,
+    ArchivedTask, ArchivedComment, Notification, Job
+)
 from .serializers import (
     UserSerializer,LoginSerializer, ProjectSerializer, 
-    ProjectMemberSerializer, TaskSerializer, CommentSerializer
+    ProjectMemberSerializer, TaskSerializer, CommentSerializer, JobSerializer, NotificationSerializer,
+    BulkProjectMemberSerializer, ProjectCloneSerializer,
+    ArchivedTaskSerializer, ArchivedCommentSerializer
 )
+from .jobs import enqueue, job_setting, pending_job
+from .archive import restore_tasks
+from .pagination import DueDateCursorPagination, NewestFirstCursorPagination
+from django.utils import timezone
 from django.shortcuts import render
+from django.http import Http404
+
+def include_archived(request):
+    """
+    Archived rows are only read when the client explicitly asks for them
+    """
+    return request.query_params.get('include_archived') in ('1', 'true')
 
 class UserViewSet(viewsets.ModelViewSet):
     """
@@ -83,6 +100,48 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        description="Delete a project. Large projects are deleted by a background job",
+        responses={202: JobSerializer(), 204: None}
+    )
+    def destroy(self, request, *args, **kwargs):
+        project = self.get_object()
+
+        # Small projects are cheap to cascade inline
+        if project.tasks.count() < job_setting('DELETE_THRESHOLD'):
+            return super().destroy(request, *args, **kwargs)
+
+        # Repeated DELETEs while the project is still being removed return the same job
+        job = pending_job('delete_project', project.id) or enqueue(
+            'delete_project', {'project_id': project.id}, user=request.user
+        )
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(
+        description="Queue a JSON export of the project, its members, tasks and comments",
+        request=None,
+        responses={202: JobSerializer()}
+    )
+    @action(detail=True, methods=['post'], url_path='export')
+    def export(self, request, pk=None):
+        project = self.get_object()
+        job = enqueue('export_project', {'project_id': project.id}, user=request.user)
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(
+        description="Copy a project with its members and tasks into a new project owned by the current user, "
+                    "who becomes its admin when members are copied",
+        request=ProjectCloneSerializer,
+        responses={201: ProjectSerializer()}
+    )
+    @action(detail=True, methods=['post'], url_path='clone', serializer_class=ProjectCloneSerializer)
+    def clone(self, request, pk=None):
+        source = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        project = serializer.save(source=source, owner=request.user)
+        return Response(ProjectSerializer(project).data, status=status.HTTP_201_CREATED)
+
 class ProjectMemberViewSet(viewsets.ModelViewSet):
     """
     API endpoint for managing project members
@@ -99,6 +158,18 @@ class ProjectMemberViewSet(viewsets.ModelViewSet):
         # For example, only allow project owners or admins to add members
         serializer.save()
 
+    @extend_schema(
+        description="Add many members to a project at once. Reports which users were added or skipped",
+        request=BulkProjectMemberSerializer
+    )
+    @action(detail=False, methods=['post'], url_path='bulk', serializer_class=BulkProjectMemberSerializer)
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+        response_status = status.HTTP_201_CREATED if result['added'] else status.HTTP_200_OK
+        return Response(result, status=response_status)
+
 class TaskViewSet(viewsets.ModelViewSet):
     """
     API endpoint for managing tasks
@@ -125,6 +196,12 @@ class TaskViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.INT, 
                 location=OpenApiParameter.QUERY,
                 description="Filter tasks by project ID"
+            ),
+            OpenApiParameter(
+                name='include_archived',
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Also list archived tasks, after the live ones. Requires project_id"
             )
         ],
         responses={200: TaskSerializer(many=True)}
@@ -133,7 +210,113 @@ class TaskViewSet(viewsets.ModelViewSet):
         project_id = request.query_params.get('project_id')
         if project_id:
             self.queryset = self.queryset.filter(project_id=project_id)
-        return super().list(request, *args, **kwargs)
+        if not include_archived(request):
+            return super().list(request, *args, **kwargs)
+        # The combined listing is not paginated, so keep it to one project
+        if not project_id:
+            return Response(
+                {'detail': 'include_archived requires project_id'}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        archived = ArchivedTask.objects.select_related('assigned_to').filter(project_id=project_id)
+        live = self.filter_queryset(self.get_queryset())
+        return Response(
+            self.get_serializer(live, many=True).data
+            + ArchivedTaskSerializer(archived, many=True).data
+        )
+
+    @extend_schema(
+        description="Retrieve a task. Pass include_archived=true to also look in the archive",
+        responses={200: TaskSerializer()}
+    )
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            if not include_archived(request):
+                raise
+        # DRF's get_object_or_404 also turns a malformed pk into a 404
+        archived = get_object_or_404(ArchivedTask, pk=kwargs['pk'])
+        return Response(ArchivedTaskSerializer(archived).data)
+
+    @extend_schema(
+        description="Move an archived task and its comments back into the live tables",
+        request=None,
+        responses={200: TaskSerializer()}
+    )
+    @action(detail=True, methods=['post'], url_path='restore')
+    def restore(self, request, pk=None):
+        if not pk.isdigit() or not restore_tasks([int(pk)]):
+            raise Http404
+        return Response(self.get_serializer(Task.objects.get(pk=pk)).data)
+
+    @extend_schema(
+        description="List tasks assigned to the current user across all projects, ordered by due date",
+        parameters=[
+            OpenApiParameter(
+                name='status',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Comma-separated statuses to include (default: todo,in_progress)"
+            ),
+            OpenApiParameter(
+                name='project_id',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Only include tasks from this project"
+            ),
+            OpenApiParameter(
+                name='group_by',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Set to 'project' to group each page of results by project"
+            ),
+            OpenApiParameter(
+                name='cursor',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Cursor from the 'next' link of the previous page"
+            ),
+            OpenApiParameter(
+                name='page_size',
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Tasks per page (default: 50, max: 200)"
+            )
+        ],
+        responses={200: TaskSerializer(many=True)}
+    )
+    @action(detail=False, methods=['get'], url_path='mine', pagination_class=DueDateCursorPagination)
+    def mine(self, request):
+        statuses = request.query_params.get('status', 'todo,in_progress').split(',')
+        valid_statuses = {choice for choice, _ in Task.STATUS_CHOICES}
+        if not set(statuses) <= valid_statuses:
+            return Response({'detail': 'Invalid status filter'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Task.objects.filter(assigned_to=request.user).select_related('project', 'assigned_to')
+        project_id = request.query_params.get('project_id')
+        if project_id:
+            if not project_id.isdigit():
+                return Response({'detail': 'Invalid project_id'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(project_id=project_id)
+
+        # One queryset per status, so each page is read as an ordered range of
+        # core_task_assignee_idx and the paginator merges them
+        page = self.paginate_queryset([queryset.filter(status=value) for value in dict.fromkeys(statuses)])
+        data = self.get_serializer(page, many=True).data
+
+        if request.query_params.get('group_by') == 'project':
+            # Group the page in memory; projects keep the order of their earliest task
+            groups = {}
+            for task, task_data in zip(page, data):
+                group = groups.setdefault(task.project_id, {
+                    'project': {'id': task.project_id, 'name': task.project.name},
+                    'tasks': [],
+                })
+                group['tasks'].append(task_data)
+            data = list(groups.values())
+
+        return self.get_paginated_response(data)
 
 class CommentViewSet(viewsets.ModelViewSet):
     """
@@ -158,6 +341,12 @@ class CommentViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.INT, 
                 location=OpenApiParameter.QUERY,
                 description="Filter comments by task ID"
+            ),
+            OpenApiParameter(
+                name='include_archived',
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Also list comments of archived tasks, after the live ones. Requires task_id"
             )
         ],
         responses={200: CommentSerializer(many=True)}
@@ -166,7 +355,83 @@ class CommentViewSet(viewsets.ModelViewSet):
         task_id = request.query_params.get('task_id')
         if task_id:
             self.queryset = self.queryset.filter(task_id=task_id)
-        return super().list(request, *args, **kwargs)
+        if not include_archived(request):
+            return super().list(request, *args, **kwargs)
+        # The combined listing is not paginated, so keep it to one task
+        if not task_id:
+            return Response(
+                {'detail': 'include_archived requires task_id'}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        archived = ArchivedComment.objects.select_related('user').filter(task_id=task_id)
+        live = self.filter_queryset(self.get_queryset())
+        return Response(
+            self.get_serializer(live, many=True).data
+            + ArchivedCommentSerializer(archived, many=True).data
+        )
+
+class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the current user's due-date notifications
+    """
+    queryset = Notification.objects.all()
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NewestFirstCursorPagination
+
+    def get_queryset(self):
+        """
+        Users only see their own notifications, optionally only unread ones
+        """
+        # Schema generation introspects the view without a real user
+        if getattr(self, 'swagger_fake_view', False):
+            return self.queryset.none()
+
+        queryset = self.queryset.filter(user=self.request.user).select_related('task')
+        if self.request.query_params.get('unread') in ('1', 'true'):
+            queryset = queryset.filter(read_at__isnull=True)
+        return queryset
+
+    @extend_schema(
+        description="Mark a notification as read",
+        request=None,
+        responses={200: NotificationSerializer()}
+    )
+    @action(detail=True, methods=['post'], url_path='read')
+    def read(self, request, pk=None):
+        notification = self.get_object()
+        if notification.read_at is None:
+            notification.read_at = timezone.now()
+            notification.save(update_fields=['read_at'])
+        return Response(self.get_serializer(notification).data)
+
+    @extend_schema(
+        description="Mark all of the current user's notifications as read",
+        request=None
+    )
+    @action(detail=False, methods=['post'], url_path='read-all')
+    def read_all(self, request):
+        updated = Notification.objects.filter(
+            user=request.user, read_at__isnull=True
+        ).update(read_at=timezone.now())
+        return Response({'updated': updated})
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for checking the status of background jobs
+    """
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Users only see the jobs they queued
+        """
+        # Schema generation introspects the view without a real user
+        if getattr(self, 'swagger_fake_view', False):
+            return self.queryset.none()
+        return self.queryset.filter(created_by=self.request.user).order_by('-created_at')
 
 def home_view(request):
     """
@@ -195,6 +460,23 @@ def home_view(request):
             'endpoints': [
                 {'method': 'GET', 'path': '/api/tasks/', 'description': 'List all tasks'},
                 {'method': 'POST', 'path': '/api/tasks/', 'description': 'Create a new task'},
+                {'method': 'GET', 'path': '/api/tasks/mine/', 'description': 'List tasks assigned to you'},
+            ]
+        },
+        {
+            'name': 'Notifications',
+            'description': 'Due-date reminders for your tasks',
+            'endpoints': [
+                {'method': 'GET', 'path': '/api/notifications/', 'description': 'List your notifications'},
+                {'method': 'POST', 'path': '/api/notifications/read-all/', 'description': 'Mark all notifications as read'},
+            ]
+        },
+        {
+            'name': 'Jobs',
+            'description': 'Track background operations',
+            'endpoints': [
+                {'method': 'GET', 'path': '/api/jobs/', 'description': 'List your background jobs'},
+                {'method': 'GET', 'path': '/api/jobs/{id}/', 'description': 'Check the status of a job'},
             ]
         },
         {
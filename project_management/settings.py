@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -130,6 +131,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Authentication
 REST_FRAMEWORK = {
     # 'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
@@ -140,6 +150,24 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Background Jobs
+# Large cascade deletes and exports are processed by `python manage.py run_jobs`
+JOB_QUEUE = {
+    'CHUNK_SIZE': 500,          # Rows deleted/read per transaction
+    'MAX_ATTEMPTS': 3,          # Attempts before a job is marked failed
+    'RETRY_DELAY': 30,          # Seconds, multiplied by the attempt number
+    'DELETE_THRESHOLD': 1000,   # Projects with at least this many tasks are deleted in the background
+    'LEASE_TIMEOUT': 1800,      # Seconds without progress before a running job is considered abandoned
+}
+
+# Response Compression
+# Brotli is used when the `brotli` package is installed and the client accepts it, gzip otherwise.
+# HTML is only gzipped, with Django's random padding against BREACH
+COMPRESSION = {
+    'MIN_SIZE': 1024,       # Bytes; smaller responses are sent uncompressed
+    'BROTLI_QUALITY': 4,
+}
+
 # Spectacular Settings
 # SPECTACULAR_SETTINGS = {
 #     'TITLE': 'Project Management API',
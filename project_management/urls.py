@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import (
@@ -13,16 +13,14 @@ from rest_framework_simplejwt.views import (
 #     SpectacularSwaggerView
 # )
 
-# drf-yasg imports
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
+# drf-yasg views are built on first request, see docs.py
+from project_management.docs import lazy_docs_view
 
 # views imports
 from core.views import (
     UserViewSet, ProjectViewSet, 
     ProjectMemberViewSet, TaskViewSet, CommentViewSet,
-    home_view
+    NotificationViewSet, JobViewSet, home_view
 )
 
 router = DefaultRouter()
@@ -31,28 +29,13 @@ router.register(r'projects', ProjectViewSet)
 router.register(r'project-members', ProjectMemberViewSet)
 router.register(r'tasks', TaskViewSet)
 router.register(r'comments', CommentViewSet)
-
-# Configure drf-yasg schema view
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Project Management API",
-      default_version='v1',
-      description="A comprehensive API for managing projects, tasks, and team collaboration",
-      terms_of_service="https://www.example.com/policies/terms/",
-      contact=openapi.Contact(email="contact@example.com"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
+router.register(r'notifications', NotificationViewSet)
+router.register(r'jobs', JobViewSet)
 
 urlpatterns = [
     # Home route
     path('', home_view, name='home'),
     
-    # Admin site
-    path('admin/', admin.site.urls),
-    
     # API routes
     path('api/', include((router.urls, 'api'), namespace='api')),
     
@@ -70,7 +53,13 @@ urlpatterns = [
     # path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 
     # Add drf-yasg routes
-    path('api/schema/', schema_view.with_ui('swagger', cache_timeout=0), name='schema'),
-    path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='swagger-ui'),
-    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='redoc'),
-]
\ No newline at end of file
+    path('api/schema/', lazy_docs_view('swagger'), name='schema'),
+    path('api/docs/', lazy_docs_view('swagger'), name='swagger-ui'),
+    path('api/redoc/', lazy_docs_view('redoc'), name='redoc'),
+]
+
+# Admin site (not installed in the API-only settings profile)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
\ No newline at end of file